@@ -1,5 +1,6 @@
 from typing import SupportsFloat, Any
 import random
+import sys
 
 import gymnasium
 import numpy as np
@@ -11,21 +12,19 @@ from src.tictactoe import TicTacToeManager
 
 
 class TicTacToeEnv(gymnasium.Env):
-    def __init__(self, size: int = 3, pieces_to_win: int = 3, depth: int = 5):
+    def __init__(self, size: int = 3, pieces_to_win: int = 3, depth: int = 5, backend: str = 'python'):
         self.depth = depth
         self.size = size
         self.manager: TicTacToeManager = TicTacToeManager(Board(size), pieces_to_win)
-        self.adversary: Adversary = Adversary(self.manager)
-        self.action_space: ActType = MoveSpace(self.manager.find_legal_moves())
+        self.adversary: Adversary = Adversary(self.manager, backend)
+        self.action_space: ActType = MoveSpace(self.manager)
         self.observation_space: ObsType = gymnasium.spaces.Discrete(3 ** (size ** 2))
 
     def reset(self, seed: int | None = None, options: dict[str, Any] | None = None) -> tuple[ObsType, dict[str, Any]]:
         self.manager.reset_board()
-        self.action_space.legal_moves = self.manager.find_legal_moves()
+        self.adversary.reset()
         # делаем первый ход(чтобы модель ходила вторая)
-        first_move = self.adversary.search_root(self.depth)
-        self.action_space.legal_moves.remove(first_move)
-        self.manager.make_move(first_move)
+        self.manager.make_move(self.adversary.search_root(self.depth))
         return self.manager.board.get_uid(), {}
 
     def step(self, action: ActType) -> tuple[ObsType, SupportsFloat, bool, bool, dict[str, Any]]:
@@ -33,8 +32,9 @@ class TicTacToeEnv(gymnasium.Env):
         :param action: Клетка, куда ходит модель
         :return: (поле, оценка, победа(bool), False, информация о шаге)
         """
-        if action not in self.manager.find_legal_moves():
+        if not self.action_space.contains(action):
             return self.manager.board.get_uid(), -10, False, False, {}
+        action = int(action)
         self.manager.make_move(action)
         reward = self.manager.check_win()
         if reward is not None:
@@ -42,7 +42,6 @@ class TicTacToeEnv(gymnasium.Env):
                     True, False, {'step': action, 'win': True, 'reward': -reward})
         # Умный ход ботяры(глубина выбирается по тому, что вам нужно)
         self.manager.make_move(self.adversary.search_root(self.depth))
-        self.action_space.legal_moves = self.manager.find_legal_moves()
         reward = self.manager.check_win()
         terminated = True if reward is not None else False
         if reward is None:
@@ -62,25 +61,43 @@ class TicTacToeEnv(gymnasium.Env):
 
 
 class MoveSpace(gymnasium.spaces.Space):
-    def __init__(self, legal_moves: list[int]):
+    def __init__(self, manager: TicTacToeManager):
+        """
+        Пространство ходов - представление свободных клеток менеджера, поэтому его не нужно обновлять после ходов.
+        :param manager: Менеджер игры.
+        """
         super().__init__()
-        self.n = len(legal_moves)
-        self.legal_moves = legal_moves
+        self.n = manager.board.size ** 2
+        self._manager: TicTacToeManager = manager
+
+    @property
+    def legal_moves(self) -> list[int]:
+        return self._manager.find_legal_moves()
 
     def sample(self, mask: Any | None = None) -> int:
-        move = random.choice(self.legal_moves)
-        self.legal_moves.remove(move)
-        return move
+        """
+        Выбирает случайный свободный ход, не меняя состояние игры.
+        :param mask: Необязательная маска длины n: ходы с нулём в маске не выбираются.
+        :return: Ход.
+        """
+        moves = self.legal_moves
+        if mask is not None:
+            moves = [move for move in moves if mask[move]]
+        return random.choice(moves)
+
+    def contains(self, x: Any) -> bool:
+        # Проверяем бит клетки в битборде свободных клеток вместо поиска в списке.
+        return (isinstance(x, int | np.integer) and 0 <= x < self.n
+                and bool(self._manager.legal_bb >> int(x) & 1))
 
 
-def display(board: list[int], size: int = 3) -> None:
+def display(board: np.ndarray, size: int = 3) -> None:
     """
     Display board.
     :param board: board
     :param size: size of the board
     :return:
     """
-    for i in range(size):
-        for j in range(size):
-            print(f'{board[i * size + j]: >2} ', end='')
-        print()
\ No newline at end of file
+    # Собираем всё поле в одну строку, чтобы вывести его одной записью.
+    rows = (''.join(f'{board[i * size + j]: >2} ' for j in range(size)) for i in range(size))
+    sys.stdout.write('\n'.join(rows) + '\n')
\ No newline at end of file
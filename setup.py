@@ -0,0 +1,8 @@
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+# Сборка расширения поиска: python setup.py build_ext --inplace
+setup(
+    name='RLTicTacToe',
+    ext_modules=cythonize([Extension('src._search', ['src/_search.pyx'])]),
+)
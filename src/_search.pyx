@@ -0,0 +1,172 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+import array
+
+from libc.stdlib cimport malloc, free
+
+# Направления линий: горизонталь, вертикаль и две диагонали. Противоположные направления обходятся со знаком минус.
+cdef int DX[4]
+cdef int DY[4]
+DX[:] = [1, 0, 1, 1]
+DY[:] = [0, 1, 1, -1]
+
+# Граница окна по умолчанию. Более широкие границы обрезаются до неё, чтобы поместиться в int.
+cdef int INF = 1 << 30
+
+
+cpdef int check_win_at_cell(signed char[::1] board, int cell, int size, int pieces_to_win) noexcept nogil:
+    """
+    Проверяет, стоит ли фигура в клетке cell в линии из pieces_to_win одинаковых фигур.
+    :param board: Доска - массив знаковых байтов длины size * size.
+    :param cell: Номер клетки.
+    :param size: Размер доски.
+    :param pieces_to_win: Количество фигур в ряд для победы.
+    :return: 1, если линия собрана, иначе 0.
+    """
+    cdef signed char value = board[cell]
+    cdef int x = cell % size
+    cdef int y = cell // size
+    cdef int d, sign, dx, dy, nx, ny, count
+    for d in range(4):
+        count = 1
+        for sign in range(-1, 2, 2):
+            dx = DX[d] * sign
+            dy = DY[d] * sign
+            nx = x + dx
+            ny = y + dy
+            while count < pieces_to_win and 0 <= nx < size and 0 <= ny < size and board[nx + ny * size] == value:
+                count += 1
+                nx += dx
+                ny += dy
+        if count >= pieces_to_win:
+            return 1
+    return 0
+
+
+cdef int find_legal_moves(signed char[::1] board, int[::1] move_order, int *out) noexcept nogil:
+    """
+    Записывает свободные клетки в out в порядке move_order.
+    :return: Количество свободных клеток.
+    """
+    cdef int count = 0
+    cdef Py_ssize_t i
+    for i in range(move_order.shape[0]):
+        if board[move_order[i]] == 0:
+            out[count] = move_order[i]
+            count += 1
+    return count
+
+
+cpdef int negamax(signed char[::1] board, int size, int pieces_to_win, int depth, int alpha, int beta,
+                  int turn, int last_move, int[::1] move_order):
+    """
+    Негамакс с альфа-бета отсечением по явному стеку. Повторяет Adversary.search без таблицы транспозиций.
+    Доска изменяется во время поиска и восстанавливается к его концу.
+    :param board: Доска - массив знаковых байтов длины size * size.
+    :param size: Размер доски.
+    :param pieces_to_win: Количество фигур в ряд для победы.
+    :param depth: Глубина поиска.
+    :param alpha: Нижняя граница окна.
+    :param beta: Верхняя граница окна.
+    :param turn: Чей ход: 1 - крестики, -1 - нолики.
+    :param last_move: Последний сделанный ход или -1, если его нет.
+    :param move_order: Порядок перебора клеток.
+    :return: Оценка позиции для игрока, который ходит.
+    """
+    cdef int cells = board.shape[0]
+    cdef int *moves = <int *> malloc((depth + 1) * cells * sizeof(int))
+    cdef int *frames = <int *> malloc((depth + 1) * 5 * sizeof(int))
+    if moves == NULL or frames == NULL:
+        free(moves)
+        free(frames)
+        raise MemoryError()
+
+    # Кадр стека sp: frames[5 * sp + k], k: 0 - alpha, 1 - beta, 2 - число ходов, 3 - индекс хода, 4 - текущий ход.
+    cdef int *frame
+    cdef int sp = 0, node_depth, evaluation, cell, result = 0
+    cdef bint entering = True, returning = False
+    with nogil:
+        frames[0] = alpha
+        frames[1] = beta
+        while True:
+            frame = frames + 5 * sp
+            # Вход в узел: либо оценка сразу известна, либо готовим список ходов.
+            if entering:
+                entering = False
+                node_depth = depth - sp
+                returning = True
+                if last_move >= 0 and check_win_at_cell(board, last_move, size, pieces_to_win):
+                    result = -node_depth
+                elif node_depth == 0:
+                    result = 0
+                else:
+                    frame[2] = find_legal_moves(board, move_order, moves + sp * cells)
+                    frame[3] = 0
+                    if frame[2] == 0:
+                        result = 0
+                    else:
+                        returning = False
+
+            # Выход из узла: откатываем ход родителя и учитываем оценку.
+            if returning:
+                if sp == 0:
+                    break
+                sp -= 1
+                frame = frames + 5 * sp
+                board[frame[4]] = 0
+                turn = -turn
+                evaluation = -result
+                returning = False
+                if evaluation >= frame[1]:
+                    result = frame[1]
+                    returning = True
+                    continue
+                if evaluation > frame[0]:
+                    frame[0] = evaluation
+
+            if frame[3] == frame[2]:
+                result = frame[0]
+                returning = True
+                continue
+
+            cell = moves[sp * cells + frame[3]]
+            frame[3] += 1
+            frame[4] = cell
+            board[cell] = turn
+            turn = -turn
+            last_move = cell
+            sp += 1
+            frames[5 * sp] = -frame[1]
+            frames[5 * sp + 1] = -frame[0]
+            entering = True
+
+    free(moves)
+    free(frames)
+    return result
+
+
+def build_move_order(manager):
+    """
+    Переводит порядок перебора ходов менеджера в массив для negamax.
+    :param manager: Менеджер игры.
+    :return: array.array('i') с номерами клеток.
+    """
+    return array.array('i', manager.move_order)
+
+
+def search(manager, int depth, alpha=-INF, beta=INF, move_order=None):
+    """
+    Запускает negamax для текущей позиции TicTacToeManager. Доска менеджера (np.int8) передаётся как буфер байтов.
+    :param manager: Менеджер игры.
+    :param depth: Глубина поиска.
+    :param alpha: Нижняя граница окна.
+    :param beta: Верхняя граница окна.
+    :param move_order: Порядок перебора из build_move_order. Порядок менеджера не меняется, поэтому при частых
+    вызовах его лучше построить один раз; если не передан, строится заново.
+    :return: Оценка позиции для игрока, который ходит.
+    """
+    if move_order is None:
+        move_order = build_move_order(manager)
+    board = manager.board.board.copy()
+    last_move = -1 if manager.last_move is None else manager.last_move
+    return negamax(board, manager.board.size, manager.pieces_to_win, depth,
+                   max(alpha, -INF), min(beta, INF), manager.turn, last_move, move_order)
@@ -1,4 +1,5 @@
 from pygame.locals import Rect
+import numpy as np
 import pygame
 from typing import Callable
 
@@ -6,27 +7,48 @@ from typing import Callable
 class Board:
     def __init__(self, size) -> None:
         self.size = size
-        self.board: list[int] = []
+        # Непрерывный массив np.int8: 1 - крестик, -1 - нолик, 0 - пусто.
+        self.board: np.ndarray = np.zeros(size * size, dtype=np.int8)
+        # Вес каждой клетки в ID доски и сам ID, который обновляется при каждом изменении клетки.
+        self._powers: list[int] = [3 ** i for i in range(size * size)]
+        self._uid: int = 0
         self.create_board()
 
     def create_board(self) -> None:
         """
-        Очистка и заполнение массива объектами типа Cell
+        Очистка доски: все клетки становятся пустыми.
         :return:
         """
-        self.board.clear()
-        for y in range(self.size):
-            for x in range(self.size):
-                self.board.append(0)
+        self.board.fill(0)
+        self._uid = sum(self._powers)
+
+    def set_cell(self, cell: int, value: int) -> None:
+        """
+        Записывает значение в клетку и пересчитывает ID доски за O(1).
+        :param cell: Номер клетки.
+        :param value: 1 - крестик, -1 - нолик, 0 - пусто.
+        """
+        self._uid += (value - int(self.board[cell])) * self._powers[cell]
+        self.board[cell] = value
 
     # Получить уникальный ID доски. Всего возможных ID: (кол-во возможных ходов) в степени (кол-во ячеек). Для 3х3: 3^9
+    # Каждая ячейка нормализуется (приводится к 0, 1, 2) и занимает свой разряд в троичной системе счисления,
+    # поэтому ID лежит в [0, 3^(size*size)). ID поддерживается в set_cell, поэтому здесь не пересчитывается.
     def get_uid(self) -> int:
-        result: int = 0
-        # Проходит по каждой ячейке доски, нормализует её (приводит к положительным числам)
-        # и выделяет ей свое место в системе счисления, равной размеру доски.
-        for i in range(len(self.board)):
-            result += self.size ** i * (self.board[i] + 1)
-        return result
+        return self._uid
+
+
+def find_legal_moves_batch(boards: np.ndarray) -> list[np.ndarray]:
+    """
+    Находит свободные клетки сразу для нескольких досок, например для параллельных сред при обучении.
+    :param boards: Массив формы (B, N) - B досок по N клеток.
+    :return: Список из B массивов с номерами свободных клеток каждой доски.
+    """
+    if boards.shape[0] == 0:
+        return []
+    rows, cells = np.nonzero(boards == 0)
+    counts = np.bincount(rows, minlength=boards.shape[0])
+    return np.split(cells, np.cumsum(counts)[:-1])
 
 
 class Clickable:
@@ -1,4 +1,6 @@
 import os
+from functools import lru_cache
+
 import pygame
 import constants as const
 
@@ -8,6 +10,23 @@ from pygame.locals import Rect
 from gui_utility import center_relative_to
 from board import Clickable
 
+# Кэш созданных шрифтов: (шрифт, размер, стиль) -> шрифт. SysFont каждый раз читает файл шрифта с диска.
+_FONT_CACHE: dict[tuple[str, int, int], pygame.font.Font] = {}
+
+
+@lru_cache(maxsize=64)
+def _load_scaled(path: os.PathLike, size: tuple[int, int]) -> pygame.Surface:
+    """
+    Загружает изображение и масштабирует его под размер. Результат кэшируется по (путь, размер).
+    :param path: Путь к изображению.
+    :param size: Размер (длина, высота).
+    :return: Готовая к отрисовке текстура.
+    """
+    img = pygame.image.load(path).convert_alpha()
+    if img.get_size() != size:
+        img = pygame.transform.smoothscale(img, size)
+    return img
+
 
 class StylizedText:
     def __init__(self, position: pygame.Rect, content: str = '', text_colour: pygame.color.Color = const.WHITE,
@@ -72,9 +91,13 @@ class StylizedText:
 
     def __create_font(self) -> pygame.font.Font:
         """
-        Создаёт шрифт исходя из входных данных.
+        Создаёт шрифт исходя из входных данных. Шрифт с теми же параметрами берётся из кэша.
         :return Возвращает созданный шрифт.
         """
+        key = (self.font_family, self.font_size, self.font_style)
+        if key in _FONT_CACHE:
+            return _FONT_CACHE[key]
+
         bold = self.__is_bold()
         italic = self.__is_italic()
         underline = self.__is_underline()
@@ -87,6 +110,7 @@ class StylizedText:
         font.set_bold(bold)
         font.set_italic(italic)
         font.set_underline(underline)
+        _FONT_CACHE[key] = font
         return font
 
     def __create_text(self) -> list[tuple[pygame.SurfaceType, pygame.Rect]]:
@@ -95,12 +119,15 @@ class StylizedText:
         :return: Список кортежей (контент, позиция).
         """
         words = self._content.split()
+        font = self.__create_font()
+        # Ширина каждого различного слова измеряется один раз, дальше ширины строк только суммируются.
+        word_widths: dict[str, int] = {word: font.size(word + ' ')[0] for word in set(words)}
+
         lines = []
         line = ''
         line_width = 0
-        font = self.__create_font()
         for word in words:
-            word_width = font.size(word + ' ')[0]
+            word_width = word_widths[word]
             # Проверка на выход за границы позиции.
             if line_width + word_width >= self.position[2]:
                 lines.append(line)
@@ -112,6 +139,8 @@ class StylizedText:
 
         lines.append(line)
 
+        # Высота строки одинакова для всего шрифта, поэтому строки повторно не измеряются.
+        half_line_height = font.get_height() // 2
         # Вычисление начального смещения по y для центрирования текста по вертикали.
         y_offset = self.position[1] + \
             (self.position[3] - len(lines) * self.font_size) // 2
@@ -120,7 +149,7 @@ class StylizedText:
             # requires antialiasing: bool
             text_surface = font.render(text_line, True, self.text_colour)
             # Вычисление центра текстуры.
-            center = (self.position[0] + self.position[2] // 2, y_offset + font.size(text_line)[1] // 2)
+            center = (self.position[0] + self.position[2] // 2, y_offset + half_line_height)
             text_rect = text_surface.get_rect(center=center)
             surfaces.append((text_surface, text_rect))
             # Обновление смещения по y для следующей строки текста.
@@ -156,7 +185,6 @@ class ClickableCell(Clickable):
         self.default_texture: pygame.color.Color | os.PathLike = default_texture
         self.hover_texture: pygame.color.Color | os.PathLike = hover_texture
         self.button_texture: pygame.color.Color | os.PathLike = self.default_texture
-        self._image_cache: pygame.SurfaceType = pygame.Surface((800, 600))
 
     def hover_click(self, event: pygame.event) -> None:
         """
@@ -182,15 +210,7 @@ class ClickableCell(Clickable):
         if isinstance(self.button_texture, pygame.color.Color):
             pygame.draw.rect(screen, self.button_texture, self.hitbox, width=0)
         elif isinstance(self.button_texture, os.PathLike):
-            # Кэшировние изображений, которые уже были зарендерены.
-            if self.button_texture != pygame.SurfaceType:
-                img = pygame.image.load(self.button_texture).convert_alpha()
-                if img.get_size() != (self.hitbox[2], self.hitbox[3]):
-                    img = pygame.transform.smoothscale(img, (self.hitbox[2], self.hitbox[3]))
-                self._image_cache = img
-            else:
-                img = self._image_cache
-
+            img = _load_scaled(self.button_texture, (self.hitbox[2], self.hitbox[3]))
             screen.blit(img, self.hitbox)
         else:
             raise TypeError('Invalid texture type')
@@ -231,7 +251,6 @@ class Button(Clickable):
         self.click_texture: pygame.color.Color | os.PathLike = click_texture
         self.button_texture: pygame.color.Color | os.PathLike = self.default_texture
         self.border_radius: int = border_radius
-        self._image_cache: pygame.SurfaceType = pygame.Surface((800, 600))
 
     def hover_click(self, event: pygame.event) -> None:
         """
@@ -258,15 +277,7 @@ class Button(Clickable):
         if isinstance(self.button_texture, pygame.color.Color):
             pygame.draw.rect(screen, self.button_texture, self.hitbox, width=0, border_radius=self.border_radius)
         elif isinstance(self.button_texture, os.PathLike):
-            # Кэшировние изображений, которые уже были зарендерены.
-            if self.button_texture != pygame.SurfaceType:
-                img = pygame.image.load(self.button_texture).convert_alpha()
-                if img.get_size() != (self.hitbox[2], self.hitbox[3]):
-                    img = pygame.transform.smoothscale(img, (self.hitbox[2], self.hitbox[3]))
-                self._image_cache = img
-            else:
-                img = self._image_cache
-
+            img = _load_scaled(self.button_texture, (self.hitbox[2], self.hitbox[3]))
             screen.blit(img, self.hitbox)
         else:
             raise TypeError('Invalid texture type')
@@ -274,7 +285,7 @@ class Button(Clickable):
         self.inner_text.render(screen)
 
     def __setattr__(self, key, value):
-        if key == 'hitbox' and isinstance(value, pygame.Rect) and self._image_cache:
+        if key == 'hitbox' and isinstance(value, pygame.Rect) and self.inner_text is not None:
             self.inner_text.position = center_relative_to(self.inner_text.position, value)
         else:
             object.__setattr__(self, key, value)
@@ -461,7 +472,6 @@ class NumberField:
             self.background_text: StylizedText = background_text
             self.text: StylizedText = StylizedText(self.hitbox, background_text.content, background_text.text_colour, background_text.font_family, background_text.font_size, background_text.font_style)
         self.max_value: int = max_value
-        self._image_cache: pygame.SurfaceType = pygame.Surface((800, 600))
         self.is_text_correct: bool = False
         self.is_selected: bool = False
 
@@ -473,16 +483,8 @@ class NumberField:
         if isinstance(self.background_texture, pygame.color.Color):
             pygame.draw.rect(screen, self.background_texture, self.hitbox, width=0)
         elif isinstance(self.background_texture, os.PathLike):
-            # Кэшировние изображений, которые уже были зарендерены.
-            if self.background_texture != pygame.SurfaceType:
-                img = pygame.image.load(self.background_texture).convert_alpha()
-                if img.get_size() != (self.hitbox[2], self.hitbox[3]):
-                    img = pygame.transform.smoothscale(img, (self.hitbox[2], self.hitbox[3]))
-                self._image_cache = img
-            else:
-                img = self._image_cache
-
-            self.screen.blit(img, self.hitbox)
+            img = _load_scaled(self.background_texture, (self.hitbox[2], self.hitbox[3]))
+            screen.blit(img, self.hitbox)
         else:
             raise TypeError('Invalid texture type')
         self.text.render(screen)  # Белый цвет текста
@@ -1,14 +1,32 @@
 import random
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
 from src.board import Board
 
+# Тип оценки, сохранённой в таблице транспозиций.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Целочисленные границы окна поиска. Все оценки - небольшие целые числа (победа * глубина),
+# поэтому бесконечности типа float не нужны.
+_NEG_INF = -1 << 30
+_POS_INF = 1 << 30
+
+# Полуширина окна аспирации вокруг оценки предыдущей итерации. Оценка победы растёт на 1 с каждой итерацией,
+# поэтому окно шире единицы.
+ASPIRATION_WINDOW = 2
+
+# Наибольшее число позиций в таблице транспозиций. Таблица живёт между поисками, давно не использованные записи
+# вытесняются.
+TT_MAX_SIZE = 200_000
+
 
 class GameManager(ABC):
     @abstractmethod
     def __init__(self, board: Board) -> None:
         self.board: Board = board
         self.turn: int = 1
+        self.hash: int = 0  # Хэш позиции, обновляется в make_move/unmake_move
 
     @abstractmethod
     def reset_board(self) -> None:
@@ -30,13 +48,93 @@ class GameManager(ABC):
     def check_win(self) -> int:
         pass
 
+    # Может ли текущий игрок выиграть одним ходом. По умолчанию неизвестно, и поиск перебирает ходы.
+    def has_winning_move(self) -> bool:
+        return False
+
+    # Хэш, общий для позиций, равных с точностью до симметрии. По умолчанию симметрии не учитываются.
+    def canonical_hash(self) -> int:
+        return self.hash
+
 
 class Adversary:
-    def __init__(self, manager: GameManager):
+    def __init__(self, manager: GameManager, backend: str = 'python', iterative_deepening: bool = False):
+        """
+        :param manager: Менеджер игры.
+        :param backend: Чем считать оценку ходов: 'python' - Adversary.search,
+        'numba' - скомпилированный поиск из src.search_numba, 'cython' - расширение src._search,
+        собираемое командой python setup.py build_ext --inplace (оба только для TicTacToeManager).
+        :param iterative_deepening: Искать в search_root итеративным углублением. Выключено по умолчанию:
+        записи таблицы транспозиций годятся только для той же глубины, поэтому мелкие итерации почти
+        не окупаются и один проход на полную глубину быстрее.
+        """
         self.manager: GameManager = manager
+        self.iterative_deepening: bool = iterative_deepening
+        match backend:
+            case 'python':
+                self._search_child = self.search
+            case 'numba':
+                from src import search_numba
+                move_order = search_numba.build_move_order(manager)
+                self._search_child = lambda depth, alpha, beta: search_numba.search(
+                    self.manager, depth, alpha, beta, move_order)
+            case 'cython':
+                from src import _search
+                move_order = _search.build_move_order(manager)
+                self._search_child = lambda depth, alpha, beta: _search.search(
+                    self.manager, depth, alpha, beta, move_order)
+            case _:
+                raise ValueError(f'Backend "{backend}" is not supported.')
+        # Таблица транспозиций: хэш позиции -> (глубина, оценка, тип оценки, лучший ход).
+        # Сохраняется между вызовами search_root: запись зависит только от позиции и глубины.
+        self.tt: OrderedDict[int, tuple[int, int, int, int | None]] = OrderedDict()
+        # Ход-убийца для каждой оставшейся глубины: последний ход, давший отсечение на этом уровне.
+        self.killers: list[int | None] = []
 
     # Возвращает текущую оценку позиции. Чем меньше ходов до победы - тем выше оценка.
-    def search(self, depth: int, alpha=float('-infinity'), beta=float('+infinity')) -> float:
+    # Негамакс с альфа-бета отсечением, развёрнутый в цикл по явному стеку вместо рекурсии.
+    def search(self, depth: int, alpha: int = _NEG_INF, beta: int = _POS_INF) -> int:
+        # Кадр стека: [глубина, alpha, beta, исходная alpha, итератор ходов, текущий ход, лучший ход]
+        stack: list[list] = []
+        result = self._enter_node(stack, depth, alpha, beta)
+
+        while stack:
+            frame = stack[-1]
+            node_depth, alpha, beta, alpha_orig, moves, cell, best_move = frame
+
+            # Вернулись из потомка: откатываем его ход и учитываем оценку.
+            if result is not None:
+                self.manager.unmake_move(cell)
+                evaluation = -result
+                result = None
+
+                if evaluation >= beta:
+                    if node_depth > 0:
+                        self.killers[node_depth] = cell
+                    self._store(self.manager.hash, (node_depth, beta, LOWER, cell))
+                    stack.pop()
+                    result = beta
+                    continue
+
+                if evaluation > alpha:
+                    frame[1] = alpha = evaluation
+                    frame[6] = best_move = cell
+
+            cell = next(moves, None)
+            if cell is None:
+                self._store(self.manager.hash, (node_depth, alpha, EXACT if alpha > alpha_orig else UPPER, best_move))
+                stack.pop()
+                result = alpha
+                continue
+
+            frame[5] = cell
+            self.manager.make_move(cell)
+            result = self._enter_node(stack, node_depth - 1, -beta, -alpha)
+
+        return result
+
+    # Оценивает позицию без перебора, если это возможно. Иначе кладёт на стек кадр узла и возвращает None.
+    def _enter_node(self, stack: list[list], depth: int, alpha: int, beta: int) -> int | None:
         win = self.manager.check_win()
         if win:
             return win * depth * self.manager.turn
@@ -44,36 +142,116 @@ class Adversary:
         if depth == 0:
             return 0
 
+        # Оценка зависит от оставшейся глубины, поэтому запись годится только для той же глубины.
+        entry = self.tt.get(self.manager.hash)
+        if entry is not None:
+            self.tt.move_to_end(self.manager.hash)
+        if entry is not None and entry[0] == depth:
+            _, value, flag, _ = entry
+            # Оценка из таблицы обрезается до окна вызывающего, как и любой результат альфа-бета с жёсткими границами.
+            if flag == EXACT:
+                return max(alpha, min(beta, value))
+            if flag == LOWER and value >= beta:
+                return beta
+            if flag == UPPER and value <= alpha:
+                return alpha
+            if flag == LOWER and value > alpha:
+                alpha = value
+            elif flag == UPPER and value < beta:
+                beta = value
+
+        # Если можно выиграть одним ходом, оценка узла равна depth - 1: лучше результата на этой глубине нет.
+        # При отрицательной глубине оценка победы отрицательна, поэтому там ходы перебираются как обычно.
+        if depth > 0 and self.manager.has_winning_move():
+            value = depth - 1
+            return beta if value >= beta else max(alpha, value)
+
         available_moves = self.manager.find_legal_moves()
 
         if not available_moves:
             return 0
 
-        for cell in available_moves:
-            self.manager.make_move(cell)
-
-            evaluation = -self.search(depth - 1, -beta, -alpha)
+        if depth >= len(self.killers):
+            self.killers.extend([None] * (depth + 1 - len(self.killers)))
+        killer = self.killers[depth] if depth > 0 else None
 
-            self.manager.unmake_move(cell)
+        # Порядок перебора: лучший ход из таблицы, ход-убийца, затем статический порядок менеджера.
+        for preferred in (killer, entry[3] if entry is not None else None):
+            if preferred is not None and preferred in available_moves:
+                available_moves.remove(preferred)
+                available_moves.insert(0, preferred)
 
-            if evaluation >= beta:
-                return beta
+        stack.append([depth, alpha, beta, alpha, iter(available_moves), None, None])
+        return None
 
-            if evaluation > alpha:
-                alpha = evaluation
+    # Сохраняет запись в таблицу транспозиций, вытесняя самую давно использованную при переполнении.
+    def _store(self, key: int, entry: tuple[int, int, int, int | None]) -> None:
+        self.tt[key] = entry
+        self.tt.move_to_end(key)
+        if len(self.tt) > TT_MAX_SIZE:
+            self.tt.popitem(last=False)
 
-        return alpha
+    # Забывает накопленные между поисками таблицу транспозиций и ходы-убийцы, например в начале новой партии.
+    def reset(self) -> None:
+        self.tt.clear()
+        self.killers = []
 
-    # Возвращает лучший ход для текущего игрока.
+    # Возвращает лучший ход для текущего игрока. Ходы корня начинаются с лучшего хода из таблицы транспозиций.
+    # С iterative_deepening: глубины 1..depth, каждая итерация начинает с лучшего хода предыдущей
+    # и ищет в окне аспирации вокруг её оценки.
     def search_root(self, depth: int) -> int:
-        moves: list[int] = self.manager.find_legal_moves()
-        best_eval = float('-infinity')
+        root_hash = self.manager.hash
+
+        # Симметричные позиции имеют одинаковую оценку, поэтому из каждой группы ходов считаем один.
+        groups: dict[int, list[int]] = {}
+        for move in self.manager.find_legal_moves():
+            self.manager.make_move(move)
+            groups.setdefault(self.manager.canonical_hash(), []).append(move)
+            self.manager.unmake_move(move)
+        representatives: list[int] = [group[0] for group in groups.values()]
+        group_of: dict[int, list[int]] = {group[0]: group for group in groups.values()}
+
+        # При depth < 1 итераций нет: один проход по ходам корня с search(depth - 1).
+        # Скомпилированные бэкенды рассчитаны только на неотрицательную глубину, поэтому здесь всегда search.
+        if depth < 1:
+            _, best_moves = self._search_root_at_depth(depth, representatives, _NEG_INF, _POS_INF, self.search)
+            return random.choice([move for representative in best_moves for move in group_of[representative]])
+
+        best_moves: list[int] = []
+        score = None
+        for current_depth in (range(1, depth + 1) if self.iterative_deepening else (depth,)):
+            entry = self.tt.get(root_hash)
+            # Запись могла остаться от прошлых поисков, где позиция была внутренним узлом.
+            if entry is not None and entry[3] in representatives:
+                representatives.remove(entry[3])
+                representatives.insert(0, entry[3])
+
+            if score is None:
+                alpha, beta = _NEG_INF, _POS_INF
+            else:
+                alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+            score, best_moves = self._search_root_at_depth(current_depth, representatives, alpha, beta)
+            # Оценка вышла за окно - повторяем поиск с полным окном.
+            if score <= alpha or score >= beta:
+                score, best_moves = self._search_root_at_depth(
+                    current_depth, representatives, _NEG_INF, _POS_INF)
+            self._store(root_hash, (current_depth, score, EXACT, best_moves[0]))
+
+        return random.choice([move for representative in best_moves for move in group_of[representative]])
+
+    # Оценивает ходы корня на заданной глубине. Возвращает лучшую оценку и все ходы с этой оценкой.
+    def _search_root_at_depth(self, depth: int, moves: list[int], alpha: int, beta: int,
+                              search_child=None) -> tuple[int, list[int]]:
+        if search_child is None:
+            search_child = self._search_child
+        best_eval = _NEG_INF
         best_possible_moves = []
 
         for move in moves:
+            # Нижняя граница на единицу ниже лучшей оценки, чтобы равные ей ходы получили точную оценку.
+            lower = alpha if best_eval == _NEG_INF else max(alpha, best_eval - 1)
             self.manager.make_move(move)
-            evaluation = -self.search(depth - 1)
-
+            evaluation = -search_child(depth - 1, -beta, -lower)
             self.manager.unmake_move(move)
 
             if evaluation > best_eval:
@@ -81,4 +259,4 @@ class Adversary:
                 best_possible_moves.clear()
             if evaluation == best_eval:
                 best_possible_moves.append(move)
-        return random.choice(best_possible_moves)
+        return best_eval, best_possible_moves
@@ -0,0 +1,180 @@
+from functools import lru_cache
+
+import numpy as np
+from numba import njit
+
+# Направления лучей. Противоположные направления стоят парами: (2i, 2i + 1) образуют одну линию.
+_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1))
+
+# Граница окна по умолчанию. Более широкие границы обрезаются до неё, чтобы поместиться в int64.
+_INF = 1 << 30
+
+
+@lru_cache(maxsize=None)
+def build_rays(size: int, pieces_to_win: int) -> np.ndarray:
+    """
+    Заранее считает соседей каждой клетки по всем 8 направлениям.
+    :param size: Размер доски.
+    :param pieces_to_win: Количество фигур в ряд для победы.
+    :return: Массив формы (size * size, 8, pieces_to_win - 1): номера клеток вдоль луча, -1 за границей доски.
+    """
+    rays = np.full((size * size, len(_DIRECTIONS), max(pieces_to_win - 1, 0)), -1, dtype=np.int64)
+    for cell in range(size * size):
+        x, y = cell % size, cell // size
+        for d, (dx, dy) in enumerate(_DIRECTIONS):
+            for i in range(1, pieces_to_win):
+                nx, ny = x + dx * i, y + dy * i
+                if not (0 <= nx < size and 0 <= ny < size):
+                    break
+                rays[cell, d, i - 1] = nx + ny * size
+    rays.setflags(write=False)
+    return rays
+
+
+@njit(cache=True)
+def check_win_at_cell(board: np.ndarray, cell: int, rays: np.ndarray, pieces_to_win: int) -> bool:
+    """
+    Проверяет, стоит ли фигура в клетке cell в линии из pieces_to_win одинаковых фигур.
+    :param board: Доска - массив np.int8 длины size * size.
+    :param cell: Номер клетки.
+    :param rays: Таблица лучей из build_rays.
+    :param pieces_to_win: Количество фигур в ряд для победы.
+    :return: True, если линия собрана.
+    """
+    value = board[cell]
+    for d in range(0, 8, 2):
+        count = 1
+        for ray in range(d, d + 2):
+            for i in range(pieces_to_win - 1):
+                neighbour = rays[cell, ray, i]
+                if neighbour < 0 or board[neighbour] != value:
+                    break
+                count += 1
+        if count >= pieces_to_win:
+            return True
+    return False
+
+
+@njit(cache=True)
+def find_legal_moves(board: np.ndarray, move_order: np.ndarray, out: np.ndarray) -> int:
+    """
+    Записывает свободные клетки в out в порядке move_order.
+    :return: Количество свободных клеток.
+    """
+    count = 0
+    for cell in move_order:
+        if board[cell] == 0:
+            out[count] = cell
+            count += 1
+    return count
+
+
+@njit(cache=True)
+def njit_search(board: np.ndarray, rays: np.ndarray, pieces_to_win: int, depth: int, alpha: int, beta: int,
+                turn: int, last_move: int, move_order: np.ndarray) -> int:
+    """
+    Негамакс с альфа-бета отсечением по явному стеку. Повторяет Adversary.search без таблицы транспозиций.
+    Доска изменяется во время поиска и восстанавливается к его концу.
+    :param board: Доска - массив np.int8 длины size * size.
+    :param rays: Таблица лучей из build_rays.
+    :param pieces_to_win: Количество фигур в ряд для победы.
+    :param depth: Глубина поиска.
+    :param alpha: Нижняя граница окна.
+    :param beta: Верхняя граница окна.
+    :param turn: Чей ход: 1 - крестики, -1 - нолики.
+    :param last_move: Последний сделанный ход или -1, если его нет.
+    :param move_order: Порядок перебора клеток.
+    :return: Оценка позиции для игрока, который ходит.
+    """
+    cells = board.shape[0]
+    moves = np.empty((depth + 1, cells), dtype=np.int64)
+    counts = np.zeros(depth + 1, dtype=np.int64)
+    index = np.zeros(depth + 1, dtype=np.int64)
+    current = np.zeros(depth + 1, dtype=np.int64)
+    alphas = np.empty(depth + 1, dtype=np.int64)
+    betas = np.empty(depth + 1, dtype=np.int64)
+
+    sp = 0
+    alphas[0] = alpha
+    betas[0] = beta
+    entering = True
+    returning = False
+    result = 0
+    while True:
+        # Вход в узел: либо оценка сразу известна, либо готовим список ходов.
+        if entering:
+            entering = False
+            node_depth = depth - sp
+            returning = True
+            if last_move >= 0 and check_win_at_cell(board, last_move, rays, pieces_to_win):
+                result = -node_depth
+            elif node_depth == 0:
+                result = 0
+            else:
+                counts[sp] = find_legal_moves(board, move_order, moves[sp])
+                index[sp] = 0
+                if counts[sp] == 0:
+                    result = 0
+                else:
+                    returning = False
+
+        # Выход из узла: откатываем ход родителя и учитываем оценку.
+        if returning:
+            if sp == 0:
+                return result
+            sp -= 1
+            board[current[sp]] = 0
+            turn = -turn
+            evaluation = -result
+            returning = False
+            if evaluation >= betas[sp]:
+                result = betas[sp]
+                returning = True
+                continue
+            if evaluation > alphas[sp]:
+                alphas[sp] = evaluation
+
+        if index[sp] == counts[sp]:
+            result = alphas[sp]
+            returning = True
+            continue
+
+        cell = moves[sp, index[sp]]
+        index[sp] += 1
+        current[sp] = cell
+        board[cell] = turn
+        turn = -turn
+        last_move = cell
+        sp += 1
+        alphas[sp] = -betas[sp - 1]
+        betas[sp] = -alphas[sp - 1]
+        entering = True
+
+
+def build_move_order(manager) -> np.ndarray:
+    """
+    Переводит порядок перебора ходов менеджера в массив для njit_search.
+    :param manager: Менеджер игры.
+    :return: Массив np.int64 с номерами клеток.
+    """
+    return np.array(manager.move_order, dtype=np.int64)
+
+
+def search(manager, depth: int, alpha: int = -_INF, beta: int = _INF, move_order: np.ndarray = None) -> int:
+    """
+    Запускает njit_search для текущей позиции TicTacToeManager.
+    :param manager: Менеджер игры.
+    :param depth: Глубина поиска.
+    :param alpha: Нижняя граница окна.
+    :param beta: Верхняя граница окна.
+    :param move_order: Порядок перебора из build_move_order. Порядок менеджера не меняется, поэтому при частых
+    вызовах его лучше построить один раз; если не передан, строится заново.
+    :return: Оценка позиции для игрока, который ходит.
+    """
+    if move_order is None:
+        move_order = build_move_order(manager)
+    board = manager.board.board.copy()
+    last_move = -1 if manager.last_move is None else manager.last_move
+    rays = build_rays(manager.board.size, manager.pieces_to_win)
+    return njit_search(board, rays, manager.pieces_to_win, depth,
+                       max(alpha, -_INF), min(beta, _INF), manager.turn, last_move, move_order)
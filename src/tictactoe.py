@@ -1,51 +1,164 @@
+import random
+from functools import lru_cache
+
 from src.board import Board
 from src.manager import GameManager
 
 
+# Зерно фиксировано, чтобы хэши позиций совпадали между запусками.
+_ZOBRIST_SEED = 0x5EED
+
+
+# Возвращает маски всех выигрышных линий: каждое окно длины pieces_to_win по строкам, столбцам и диагоналям.
+@lru_cache(maxsize=None)
+def _build_win_masks(size: int, pieces_to_win: int) -> tuple[int, ...]:
+    masks: list[int] = []
+    for direction in ((1, 0), (0, 1), (1, 1), (-1, 1)):
+        for y in range(size):
+            for x in range(size):
+                end_x = x + direction[0] * (pieces_to_win - 1)
+                end_y = y + direction[1] * (pieces_to_win - 1)
+                if not (0 <= end_x < size and 0 <= end_y < size):
+                    continue
+                mask = 0
+                for i in range(pieces_to_win):
+                    mask |= 1 << (x + direction[0] * i + (y + direction[1] * i) * size)
+                masks.append(mask)
+    return tuple(masks)
+
+
+# Возвращает 8 симметрий квадратной доски (повороты и отражения) как перестановки клеток: perm[cell] -> образ клетки.
+@lru_cache(maxsize=None)
+def _build_symmetries(size: int) -> tuple[tuple[int, ...], ...]:
+    last = size - 1
+    transforms = (
+        lambda x, y: (x, y),
+        lambda x, y: (last - y, x),
+        lambda x, y: (last - x, last - y),
+        lambda x, y: (y, last - x),
+        lambda x, y: (last - x, y),
+        lambda x, y: (x, last - y),
+        lambda x, y: (y, x),
+        lambda x, y: (last - y, last - x),
+    )
+    symmetries: list[tuple[int, ...]] = []
+    for transform in transforms:
+        perm = []
+        for cell in range(size * size):
+            x, y = transform(cell % size, cell // size)
+            perm.append(x + y * size)
+        symmetries.append(tuple(perm))
+    return tuple(symmetries)
+
+
 class TicTacToeManager(GameManager):
     def __init__(self, board: Board = Board(3), pieces_to_win: int = None):
         if not pieces_to_win:
             pieces_to_win = board.size
         self.board: Board = board
-        self._crosses: list[int] = []
-        self._noughts: list[int] = []
+        self.crosses_bb: int = 0
+        self.noughts_bb: int = 0
         self._last_move: int = None
         self.turn: int = 1  # 1 - крестик, -1 - нолик
         self.pieces_to_win: int = pieces_to_win
 
+        cells = board.size * board.size
+        self.full_mask: int = (1 << cells) - 1
+        self.legal_bb: int = self.full_mask  # Свободные клетки, обновляется в make_move/unmake_move
+        self.win_masks: tuple[int, ...] = _build_win_masks(board.size, pieces_to_win)
+        # Для каждой клетки храним только те линии, которые через неё проходят.
+        self._cell_masks: tuple[tuple[int, ...], ...] = tuple(
+            tuple(mask for mask in self.win_masks if mask >> cell & 1) for cell in range(cells))
+        # Статический порядок перебора ходов: сначала клетки, через которые проходит больше линий
+        # (центр, затем углы), при равенстве - ближе к центру.
+        center = (board.size - 1) / 2
+        self._move_order: tuple[int, ...] = tuple(sorted(
+            range(cells),
+            key=lambda cell: (-len(self._cell_masks[cell]),
+                              (cell % board.size - center) ** 2 + (cell // board.size - center) ** 2)))
+
+        # Ключи Zobrist: [0] - крестики, [1] - нолики. Хэш позиции - XOR ключей занятых клеток.
+        zobrist_random = random.Random(_ZOBRIST_SEED)
+        self._z: list[list[int]] = [[zobrist_random.getrandbits(64) for _ in range(cells)] for _ in range(2)]
+        self.hash: int = 0
+        self._symmetries: tuple[tuple[int, ...], ...] = _build_symmetries(board.size)
+
+    @property
+    def last_move(self) -> int | None:
+        return self._last_move
+
+    @property
+    def move_order(self) -> tuple[int, ...]:
+        return self._move_order
+
     def reset_board(self):
         self.board.create_board()
-        self._crosses: list[int] = []
-        self._noughts: list[int] = []
+        self.crosses_bb: int = 0
+        self.noughts_bb: int = 0
         self._last_move: int = None
         self.turn: int = 1
+        self.hash: int = 0
+        self.legal_bb: int = self.full_mask
 
     def make_move(self, cell: int):
         if self.turn == 1:
-            self._crosses.append(cell)
+            self.crosses_bb |= 1 << cell
+            self.hash ^= self._z[0][cell]
         else:
-            self._noughts.append(cell)
-        self.board.board[cell] = self.turn
+            self.noughts_bb |= 1 << cell
+            self.hash ^= self._z[1][cell]
+        self.legal_bb ^= 1 << cell
+        self.board.set_cell(cell, self.turn)
         self.turn *= -1
         self._last_move = cell
 
     def unmake_move(self, cell: int):
         if self.turn == -1:
-            self._crosses.remove(cell)
+            self.crosses_bb ^= 1 << cell
+            self.hash ^= self._z[0][cell]
         else:
-            self._noughts.remove(cell)
-        self.board.board[cell] = 0
+            self.noughts_bb ^= 1 << cell
+            self.hash ^= self._z[1][cell]
+        self.legal_bb |= 1 << cell
+        self.board.set_cell(cell, 0)
         self.turn *= -1
         self._last_move = None
 
-    # Возвращает массив свободных клеточек
+    # Возвращает массив свободных клеточек в порядке перебора _move_order
     def find_legal_moves(self):
-        legal_moves: list[int] = []
-        for i, cell in enumerate(self.board.board):
-            if cell == 0:
-                legal_moves.append(i)
+        legal: int = self.legal_bb
+        return [cell for cell in self._move_order if legal >> cell & 1]
 
-        return legal_moves
+    # Проверяет, может ли текущий игрок выиграть одним ходом: есть линия с pieces_to_win - 1 его фигурами
+    # и без фигур соперника.
+    def has_winning_move(self) -> bool:
+        if self.turn == 1:
+            mine, opponent = self.crosses_bb, self.noughts_bb
+        else:
+            mine, opponent = self.noughts_bb, self.crosses_bb
+        need = self.pieces_to_win - 1
+        for mask in self.win_masks:
+            if not opponent & mask and (mine & mask).bit_count() == need:
+                return True
+        return False
+
+    # Возвращает хэш позиции, одинаковый для всех её поворотов и отражений: минимум хэшей по 8 симметриям.
+    def canonical_hash(self) -> int:
+        occupied: list[tuple[list[int], int]] = []
+        for keys, bb in ((self._z[0], self.crosses_bb), (self._z[1], self.noughts_bb)):
+            while bb:
+                lsb = bb & -bb
+                occupied.append((keys, lsb.bit_length() - 1))
+                bb ^= lsb
+
+        result: int = self.hash
+        for perm in self._symmetries:
+            h = 0
+            for keys, cell in occupied:
+                h ^= keys[perm[cell]]
+            if h < result:
+                result = h
+        return result
 
     # Возвращает 1, если выиграли белые, -1 - черные, 0 - ничья, None - игра еще не закончилась.
     def check_win(self):
@@ -53,44 +166,16 @@ class TicTacToeManager(GameManager):
             return None
         win = self._check_win_at_cell(self._last_move)
         if not win:
-            if not self.find_legal_moves():
+            if not self.legal_bb:
                 return 0
             else:
                 return None
         return win * -self.turn
 
     def _check_win_at_cell(self, cell: int) -> int:
-        size: int = self.board.size
-
-        left_diagonal = ((-1, -1), (1, 1))
-        right_diagonal = ((1, -1), (-1, 1))
-        horizontal = ((-1, 0), (1, 0))
-        vertical = ((0, -1), (0, 1))
-
-        cell_content: int = self.board.board[cell]
-
-        for direction in (left_diagonal, right_diagonal, horizontal, vertical):
-            direction_sum = 1
-            for direction_vec in direction:
-                next_cell: int = cell
-                for i in range(1, self.pieces_to_win):
-
-                    if not self._check_borders(next_cell, direction_vec):
-                        break
-
-                    next_cell = cell + (direction_vec[0] + direction_vec[1] * size) * i
-
-                    next_cell_content: int = self.board.board[next_cell]
-
-                    if next_cell_content != cell_content:
-                        break
-
-                    direction_sum += 1
-            if direction_sum >= self.pieces_to_win:
+        bb: int = self.crosses_bb if self.crosses_bb >> cell & 1 else self.noughts_bb
+        for mask in self._cell_masks[cell]:
+            if bb & mask == mask:
                 return 1
 
         return 0
-
-    def _check_borders(self, cell: int, direction: tuple[int, int]) -> bool:
-        x, y = cell % self.board.size, cell // self.board.size
-        return 0 <= x + direction[0] < self.board.size and 0 <= y + direction[1] < self.board.size
\ No newline at end of file
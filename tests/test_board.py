@@ -0,0 +1,28 @@
+import unittest
+
+import numpy as np
+
+from src.board import Board, find_legal_moves_batch
+
+
+class TestBoard(unittest.TestCase):
+    def test_uid_is_base_3(self):
+        # ID должен совпадать с полным пересчётом в троичной системе и помещаться в Discrete(3 ** (size * size)).
+        rng = np.random.default_rng(0)
+        for size in (2, 3, 4):
+            board = Board(size)
+            for _ in range(50):
+                board.set_cell(int(rng.integers(size * size)), int(rng.integers(-1, 2)))
+                expected = sum(int(value + 1) * 3 ** i for i, value in enumerate(board.board))
+                self.assertEqual(board.get_uid(), expected)
+                self.assertLess(board.get_uid(), 3 ** (size * size))
+
+    def test_find_legal_moves_batch(self):
+        boards = np.array([[1, 0], [1, -1], [0, 0]], dtype=np.int8)
+        result = find_legal_moves_batch(boards)
+        self.assertEqual([moves.tolist() for moves in result], [[1], [], [0, 1]])
+        self.assertEqual(find_legal_moves_batch(np.zeros((0, 4), dtype=np.int8)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
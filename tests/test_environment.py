@@ -0,0 +1,21 @@
+import unittest
+
+from environment.tictactoe_gym import TicTacToeEnv
+
+
+class TestTicTacToeEnv(unittest.TestCase):
+    def test_depth_zero(self):
+        # rl.ipynb создаёт среду с depth=0: соперник должен ходить и при нулевой глубине.
+        env = TicTacToeEnv(depth=0)
+        obs, info = env.reset()
+        self.assertEqual(info, {})
+        self.assertEqual(len(env.action_space.legal_moves), 8)
+
+        obs, reward, terminated, truncated, info = env.step(env.action_space.sample())
+        self.assertEqual(info['reward'], reward)
+        if not terminated:
+            self.assertEqual(len(env.action_space.legal_moves), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
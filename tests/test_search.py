@@ -0,0 +1,142 @@
+import random
+import unittest
+from unittest import mock
+
+from src.board import Board
+from src.manager import Adversary
+from src.tictactoe import TicTacToeManager
+
+INF = 1 << 30
+
+# (размер доски, фигур в ряд, глубина поиска, число позиций)
+CONFIGS = ((3, 3, 9, 20), (4, 3, 3, 20), (4, 4, 4, 10))
+
+
+def negamax(manager: TicTacToeManager, depth: int, alpha: int = -INF, beta: int = INF) -> int:
+    """
+    Эталон: рекурсивный негамакс с альфа-бета отсечением без таблиц и упорядочивания ходов.
+    """
+    win = manager.check_win()
+    if win:
+        return win * depth * manager.turn
+    if depth == 0:
+        return 0
+    moves = manager.find_legal_moves()
+    if not moves:
+        return 0
+    for cell in moves:
+        manager.make_move(cell)
+        evaluation = -negamax(manager, depth - 1, -beta, -alpha)
+        manager.unmake_move(cell)
+        if evaluation >= beta:
+            return beta
+        if evaluation > alpha:
+            alpha = evaluation
+    return alpha
+
+
+def best_moves(manager: TicTacToeManager, depth: int) -> set[int]:
+    """
+    Эталон для search_root: все ходы с лучшей оценкой.
+    """
+    evaluations = {}
+    for cell in manager.find_legal_moves():
+        manager.make_move(cell)
+        evaluations[cell] = -negamax(manager, depth - 1)
+        manager.unmake_move(cell)
+    best = max(evaluations.values())
+    return {cell for cell, evaluation in evaluations.items() if evaluation == best}
+
+
+def random_positions(size: int, pieces_to_win: int, count: int, rng: random.Random):
+    """
+    Возвращает менеджеры со случайными достижимыми позициями, в которых игра ещё не закончилась.
+    """
+    positions = []
+    while len(positions) < count:
+        manager = TicTacToeManager(Board(size), pieces_to_win)
+        for _ in range(rng.randint(0, size * size // 2)):
+            manager.make_move(rng.choice(manager.find_legal_moves()))
+            if manager.check_win() is not None:
+                break
+        if manager.check_win() is None:
+            positions.append(manager)
+    return positions
+
+
+def root_candidates(adversary: Adversary, depth: int) -> set[int]:
+    """
+    Возвращает множество ходов, из которых search_root делает случайный выбор.
+    """
+    with mock.patch('src.manager.random.choice', side_effect=lambda moves: moves[0]) as choice:
+        adversary.search_root(depth)
+    return set(choice.call_args.args[0])
+
+
+class TestSearch(unittest.TestCase):
+    def check_adversary(self, make_adversary):
+        rng = random.Random(0)
+        for size, pieces_to_win, depth, count in CONFIGS:
+            for manager in random_positions(size, pieces_to_win, count, rng):
+                adversary = make_adversary(manager)
+                with self.subTest(size=size, pieces_to_win=pieces_to_win, board=manager.board.board.tolist()):
+                    self.assertEqual(adversary.search(depth), negamax(manager, depth))
+                    for _ in range(5):
+                        alpha = rng.randint(-depth - 1, depth)
+                        beta = rng.randint(alpha + 1, depth + 2)
+                        self.assertEqual(adversary.search(depth, alpha, beta), negamax(manager, depth, alpha, beta))
+                    self.assertEqual(root_candidates(adversary, depth), best_moves(manager, depth))
+
+    def test_fresh_adversary(self):
+        self.check_adversary(Adversary)
+
+    def test_iterative_deepening(self):
+        self.check_adversary(lambda manager: Adversary(manager, iterative_deepening=True))
+
+    def test_long_lived_adversary(self):
+        # Одна таблица транспозиций на всю партию: записи прошлых поисков не должны менять результат.
+        rng = random.Random(1)
+        for size, pieces_to_win, depth, _ in CONFIGS:
+            manager = TicTacToeManager(Board(size), pieces_to_win)
+            adversary = Adversary(manager)
+            for _ in range(3):
+                manager.reset_board()
+                while manager.check_win() is None:
+                    with self.subTest(size=size, pieces_to_win=pieces_to_win, board=manager.board.board.tolist()):
+                        alpha = rng.randint(-depth - 1, depth)
+                        beta = rng.randint(alpha + 1, depth + 2)
+                        self.assertEqual(adversary.search(depth, alpha, beta), negamax(manager, depth, alpha, beta))
+                        self.assertEqual(root_candidates(adversary, depth), best_moves(manager, depth))
+                    manager.make_move(rng.choice(manager.find_legal_moves()))
+
+
+class TestBackends(unittest.TestCase):
+    def check_backend(self, module, backend: str):
+        rng = random.Random(2)
+        for size, pieces_to_win, depth, count in CONFIGS:
+            for manager in random_positions(size, pieces_to_win, count, rng):
+                with self.subTest(size=size, pieces_to_win=pieces_to_win, board=manager.board.board.tolist()):
+                    self.assertEqual(module.search(manager, depth), negamax(manager, depth))
+                    alpha = rng.randint(-depth - 1, depth)
+                    beta = rng.randint(alpha + 1, depth + 2)
+                    self.assertEqual(module.search(manager, depth, alpha, beta), negamax(manager, depth, alpha, beta))
+                    self.assertEqual(root_candidates(Adversary(manager, backend), depth),
+                                     root_candidates(Adversary(manager), depth))
+
+    def test_numba(self):
+        try:
+            from src import search_numba
+        except ImportError:
+            self.skipTest('numba is not installed')
+        self.check_backend(search_numba, 'numba')
+
+    def test_cython(self):
+        try:
+            from src import _search
+        except ImportError:
+            self.skipTest('src._search is not built: python setup.py build_ext --inplace')
+        self.check_backend(_search, 'cython')
+
+
+if __name__ == '__main__':
+    unittest.main()